@@ -0,0 +1,67 @@
+#python
+# bench_enumeration.py
+
+# Compares the TD API calls the popup.* commands used to make against the
+# lx service based enumeration in tc_popups.scene.
+#
+# Run from inside Modo with the kit installed (tc_popups is imported from the
+# kit's lxserv directory):
+#   @{path/to/bench_enumeration.py} [itemCount]
+#
+# By default a new scene is populated with 100,000 mask items. Building that
+# scene takes a while; the timings are printed to the Event Log.
+
+
+import time
+
+import lx
+import modo
+
+from tc_popups import scene
+
+
+def timed(label, func, repeat=5):
+    '''
+    Run func a number of times and print the best time to the Event Log.
+    '''
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    lx.out('%-40s %8.3f s' %(label, best))
+
+
+def td_material_names():
+    allMasks = modo.Scene().items(lx.symbol.sITYPE_MASK)
+    return [x.name for x in allMasks]
+
+
+def lx_material_names():
+    return [name for ident, name in scene.items_by_type(lx.symbol.sITYPE_MASK)]
+
+
+def td_selected_channels():
+    return modo.Scene().selected[0].channelNames
+
+
+def lx_selected_channels():
+    return scene.channel_names(scene.selected_item())
+
+
+args = lx.args()
+count = int(args[0]) if args else 100000
+
+lx.eval('scene.new')
+bench = modo.Scene()
+for i in range(count):
+    bench.addItem(lx.symbol.sITYPE_MASK)
+bench.select(bench.addItem(modo.constants.LOCATOR_TYPE))
+
+lx.out('Enumeration benchmark, %d mask items' %count)
+timed('modo.Scene().items(sITYPE_MASK)', td_material_names)
+timed('tc_popups.scene.items_by_type()', lx_material_names)
+timed('modo.Scene().selected[0].channelNames', td_selected_channels)
+timed('tc_popups.scene.channel_names(selected_item())', lx_selected_channels)
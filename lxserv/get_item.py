@@ -22,6 +22,8 @@ import lx
 import lxu
 import modo
 
+from tc_popups.match import find_match
+
 from PySide.QtGui import *
 from PySide.QtCore import *
 
@@ -72,6 +74,18 @@ def parse_all_the_things():
                     # lx.out(traceback.format_exc())
 
 
+
+def create_item(item, context):
+    '''
+    Create an item of the given type, and add it to the schematic if needed.
+    '''
+    lx.eval("popup.createItem {%s}" %item)
+    if context == 'schematic':
+        lx.eval("select.drop schmNode")
+        lx.eval("select.drop link")
+        lx.eval("schematic.addItem")
+
+
 class CustomStringModel(QStringListModel):
     '''
     Custom Qt Data model derived from a simple string list.
@@ -206,11 +220,7 @@ class Popup(QDialog):
         if index.isValid():
             item = DATADICT[self.proxyModel.data(index)]
             try:
-                lx.eval("popup.createItem {%s}" %item)
-                if self.context == 'schematic':
-                    lx.eval("select.drop schmNode")
-                    lx.eval("select.drop link")
-                    lx.eval("schematic.addItem")
+                create_item(item, self.context)
             except:
                 lx.out(traceback.format_exc())
                 modo.dialogs.alert('Failed', 'Unable to create item. See Event Log for details', dtype='warning')
@@ -251,10 +261,14 @@ class CreateItem ( lxu.command.BasicCommand ):
 class GetItem ( lxu.command.BasicCommand ):
     '''
     Custom Command to spawn the popup.
+    If a query is given, the best matching item type is created directly
+    and no pop-up is displayed, which is useful for scripts and macros.
     '''
     def __init__(self):
         lxu.command.BasicCommand.__init__(self)
         self.dyna_Add('context', lx.symbol.sTYPE_STRING)
+        self.dyna_Add('query', lx.symbol.sTYPE_STRING)
+        self.basic_SetFlags(1, lx.symbol.fCMDARG_OPTIONAL)
 
     def cmd_Interact(self):
         '''
@@ -269,8 +283,25 @@ class GetItem ( lxu.command.BasicCommand ):
 
     def basic_Execute(self, msg, flags):
         '''
-        Display the pop-up search field.
+        Display the pop-up search field, or create the item directly from a query.
         '''
+        if self.dyna_IsSet(1):
+            if not self.dyna_String(1):
+                lx.out('popup.getItem: the query is empty')
+                msg.SetCode(lx.result.FAILED)
+                return
+            match = find_match(self.dyna_String(1), DATALIST)
+            if match is None:
+                lx.out('popup.getItem: no item type matches "%s"' %self.dyna_String(1))
+                msg.SetCode(lx.result.FAILED)
+                return
+            try:
+                create_item(DATADICT[match], self.dyna_String(0))
+            except:
+                lx.out(traceback.format_exc())
+                msg.SetCode(lx.result.FAILED)
+            return
+
         self.popup = Popup(self.dyna_String(0))
 
         # Move the dialog to the cursor's position
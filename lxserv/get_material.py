@@ -14,14 +14,31 @@
 #   5- Process the selected data and do something with it.
 
 
+import traceback
+
 import lx
 import lxu
 import modo
 
+from tc_popups import prefetch, scene
+from tc_popups.match import find_match
+
 from PySide.QtGui import *
 from PySide.QtCore import *
 
 
+def get_material_names():
+    '''
+    Return a sorted list of the material tags in the scene,
+    from the prefetch cache if it's available.
+    '''
+    names = prefetch.cached('materials')
+    if names is None:
+        names = scene.material_names()
+    return names
+
+
+
 class CustomStringModel(QStringListModel):
     '''
     Custom Qt Data model derived from a simple string list.
@@ -85,8 +102,7 @@ class Popup(QDialog):
         self.listView.setEditTriggers(QAbstractItemView.NoEditTriggers)
 
         # gather data to display in our listView
-        self.allMasks = modo.Scene().items(modo.constants.MASK_TYPE)
-        self.allMatNames = sorted([x.name.split(' (Material)')[0] for x in self.allMasks if x.name.endswith('(Material)')])
+        self.allMatNames = get_material_names()
 
         # set up a data model with a proxy so we can filter it
         self.listModel = CustomStringModel(self.allMatNames)
@@ -176,9 +192,13 @@ class Popup(QDialog):
 class GetMaterial ( lxu.command.BasicCommand ):
     '''
     Custom Command to spawn the popup.
+    If a query is given, the best matching material is applied directly
+    and no pop-up is displayed, which is useful for scripts and macros.
     '''
     def __init__(self):
         lxu.command.BasicCommand.__init__(self)
+        self.dyna_Add('query', lx.symbol.sTYPE_STRING)
+        self.basic_SetFlags(0, lx.symbol.fCMDARG_OPTIONAL)
 
     def cmd_Interact(self):
         '''
@@ -193,8 +213,26 @@ class GetMaterial ( lxu.command.BasicCommand ):
 
     def basic_Execute(self, msg, flags):
         '''
-        Display the pop-up search field.
-        '''
+        Display the pop-up search field, or apply the material directly from a query.
+        '''
+        if self.dyna_IsSet(0):
+            query = self.dyna_String(0)
+            if not query:
+                lx.out('popup.getMaterial: the query is empty')
+                msg.SetCode(lx.result.FAILED)
+                return
+            try:
+                match = find_match(query, get_material_names())
+                if match is not None:
+                    lx.eval('poly.setMaterial {%s}' %str(match))
+                else:
+                    # as with an empty search result in the pop-up, create a new material from the query
+                    lx.eval('material.new {%s} true false'%query)
+            except:
+                lx.out(traceback.format_exc())
+                msg.SetCode(lx.result.FAILED)
+            return
+
         self.popup = Popup()
 
         # Move the dialog to the cursor's position
@@ -0,0 +1,46 @@
+# popup.prefetch
+# Turns speculative prefetching of the pop-up data on or off.
+
+# With prefetching on, the channel list of the selected item and the scene's
+# material list are gathered in idle time after the selection or scene changes,
+# so that popup.selectChannel and popup.getMaterial can be displayed right away.
+# See lxserv/tc_popups/prefetch.py for details.
+
+
+import lx
+import lxu
+
+from tc_popups import prefetch
+
+
+class Prefetch ( lxu.command.BasicCommand ):
+    '''
+    Custom Command to enable or disable prefetching.
+    '''
+    def __init__(self):
+        lxu.command.BasicCommand.__init__(self)
+        self.dyna_Add('enable', lx.symbol.sTYPE_BOOLEAN)
+
+    def cmd_Interact(self):
+        '''
+        Boilerplate
+        '''
+
+    def cmd_Flags(self):
+        '''
+        No undo context, this only changes UI state
+        '''
+        return lx.symbol.fCMD_UI
+
+    def basic_Execute(self, msg, flags):
+        '''
+        Start or stop the prefetch listener.
+        '''
+        if self.dyna_Bool(0):
+            prefetch.start()
+        else:
+            prefetch.stop()
+
+
+# Bless this mess!
+lx.bless(Prefetch, "popup.prefetch")
@@ -14,14 +14,30 @@
 #   5- Process the selected data and do something with it.
 
 
+import traceback
+
 import lx
 import lxu
 import modo
 
+from tc_popups import prefetch, scene
+from tc_popups.match import find_match
+
 from PySide.QtGui import *
 from PySide.QtCore import *
 
 
+
+def get_channel_names(item):
+    '''
+    Return the channel names of an item, from the prefetch cache if it's available.
+    '''
+    channels = prefetch.channel_names(item)
+    if channels is None:
+        channels = scene.channel_names(item)
+    return channels
+
+
 class CustomStringModel(QStringListModel):
     '''
     Custom Qt Data model derived from a simple string list, from which
@@ -53,7 +69,7 @@ class Popup(QDialog):
     '''
      pop-up search field
     '''
-    def __init__(self):
+    def __init__(self, ident, channels):
         '''
         Constructor
         '''
@@ -69,9 +85,9 @@ class Popup(QDialog):
         # remove the window frame, ensure pop-up look and feel
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Popup)
 
-        # gather data to display in our listView
-        self.selection = modo.Scene().selected[0]
-        self.channels = self.selection.channelNames
+        # data to display in our listView, gathered by the command
+        self.ident = ident
+        self.channels = channels
 
         # create a label
         self.label = QLabel('Select a channel...')
@@ -158,7 +174,7 @@ class Popup(QDialog):
         if index.isValid():
             data = str(self.proxyModel.data(index))
             try:
-                lx.eval('select.channel  {%s:%s} set' %(self.selection.Ident(), data))
+                lx.eval('select.channel  {%s:%s} set' %(self.ident, data))
             except:
                 modo.dialogs.alert('Failed', 'Unable to select the channels. See Event Log for details', dtype='warning')
         self.close()
@@ -167,9 +183,13 @@ class Popup(QDialog):
 class SelectChannel ( lxu.command.BasicCommand ):
     '''
     Custom Command to spawn the popup.
+    If a query is given, the best matching channel of the selected item is
+    selected directly and no pop-up is displayed, which is useful for scripts and macros.
     '''
     def __init__(self):
         lxu.command.BasicCommand.__init__(self)
+        self.dyna_Add('query', lx.symbol.sTYPE_STRING)
+        self.basic_SetFlags(0, lx.symbol.fCMDARG_OPTIONAL)
 
     def cmd_Interact(self):
         '''
@@ -184,10 +204,34 @@ class SelectChannel ( lxu.command.BasicCommand ):
 
     def basic_Execute(self, msg, flags):
         '''
-        Display the pop-up search field.
+        Display the pop-up search field, or select the channel directly from a query.
         '''
-        if len(modo.Scene().selected) > 0:
-            self.popup = Popup()
+        # look up the selection once and hand it to the pop-up
+        item = scene.selected_item()
+
+        if self.dyna_IsSet(0):
+            if not self.dyna_String(0):
+                lx.out('popup.selectChannel: the query is empty')
+                msg.SetCode(lx.result.FAILED)
+                return
+            if item is None:
+                lx.out('popup.selectChannel: nothing is selected')
+                msg.SetCode(lx.result.FAILED)
+                return
+            match = find_match(self.dyna_String(0), get_channel_names(item))
+            if match is None:
+                lx.out('popup.selectChannel: no channel matches "%s"' %self.dyna_String(0))
+                msg.SetCode(lx.result.FAILED)
+                return
+            try:
+                lx.eval('select.channel  {%s:%s} set' %(item.Ident(), match))
+            except:
+                lx.out(traceback.format_exc())
+                msg.SetCode(lx.result.FAILED)
+            return
+
+        if item is not None:
+            self.popup = Popup(item.Ident(), get_channel_names(item))
 
             # Move the dialog to the cursor position
             self.popup.move( QCursor().pos() )
@@ -0,0 +1,6 @@
+# tc_popups
+# Shared helpers for the popup.* commands.
+
+# This package lives under lxserv/ because that's the directory Modo reliably puts
+# on sys.path for a kit's plugins (901+), so the commands can import it directly.
+# It contains no blessed servers of its own.
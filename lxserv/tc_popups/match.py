@@ -0,0 +1,21 @@
+# tc_popups.match
+# Query matching for the popup.* commands' scripted mode.
+
+
+def find_match(query, data):
+    '''
+    Return the best match for the query in the data list, or None.
+    Uses the same case-insensitive substring rule as the pop-up's filter,
+    preferring an exact match over the first partial one.
+    An empty query never matches.
+    '''
+    query = query.lower()
+    if not query:
+        return None
+    partial = None
+    for value in data:
+        if value.lower() == query:
+            return value
+        if partial is None and query in value.lower():
+            partial = value
+    return partial
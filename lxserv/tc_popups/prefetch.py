@@ -0,0 +1,207 @@
+# tc_popups.prefetch
+# Optional speculative prefetch of the data shown by the pop-ups.
+
+# While running, a listener watches the item selection and the scene. Whenever
+# something relevant changes, the affected cache entries are dropped and a short
+# single-shot timer is (re)started. When the timer fires in idle time, the channel
+# list of the selected item and the scene's material list are gathered and cached,
+# so that popup.selectChannel and popup.getMaterial can display them right away.
+# Restarting the timer on every event means a burst of selection changes in the
+# viewport only triggers a single prefetch once things settle down.
+
+
+import traceback
+
+import lx
+import lxifc
+
+from PySide.QtCore import QTimer
+
+from tc_popups import scene
+
+
+# milliseconds to wait after the last change before prefetching
+PREFETCH_DELAY = 250
+
+# mask channels the material list depends on: the polygon tag, and the tag type
+# that gives the mask its " (Material)" suffix
+MASK_CHANNELS = ('ptag', 'ptyp')
+
+# 'materials' -> list of material names
+# 'channels'  -> (item ident, channel count, list of channel names)
+_cache = {}
+
+_listener = None
+
+# set when a prefetch fails, so that mask changes keep scheduling a retry even
+# though there's no material list left in the cache to invalidate
+_retry = False
+
+
+def cached(key):
+    '''
+    Return the cached value for key, or None if it isn't available.
+    '''
+    return _cache.get(key)
+
+
+def invalidate(key=None):
+    '''
+    Drop a single cache entry, or the whole cache if no key is given.
+    '''
+    if key is None:
+        _cache.clear()
+    else:
+        _cache.pop(key, None)
+
+
+def channel_names(item):
+    '''
+    Return the cached channel names for an lx.object.Item, or None if the cache
+    doesn't hold them. The channel count is compared as well as the ident, so a
+    list that went stale without an event reaching the listener isn't used.
+    '''
+    channels = cached('channels')
+    if channels is not None and channels[:2] == (item.Ident(), item.ChannelCount()):
+        return channels[2]
+    return None
+
+
+def prefetch():
+    '''
+    Fill in any missing cache entries.
+    '''
+    global _retry
+    try:
+        if 'materials' not in _cache:
+            _cache['materials'] = scene.material_names()
+            if _listener is not None and not _listener.maskIndices:
+                indices = [scene.channel_index(lx.symbol.sITYPE_MASK, name) for name in MASK_CHANNELS]
+                if None not in indices:
+                    _listener.maskIndices = set(indices)
+
+        item = scene.selected_item()
+        if item is not None and channel_names(item) is None:
+            _cache['channels'] = (item.Ident(), item.ChannelCount(), scene.channel_names(item))
+        _retry = False
+    except:
+        # the scene may be in flux (e.g. being closed), try again on the next change
+        lx.out(traceback.format_exc())
+        invalidate()
+        _retry = True
+
+
+class PrefetchListener(lxifc.SelectionListener, lxifc.SceneItemListener):
+    '''
+    Invalidate the cache on selection and scene changes, and schedule a prefetch.
+    '''
+    def __init__(self):
+        selServ = lx.service.Selection()
+        self.itemSelType = selServ.LookupType(lx.symbol.sSELTYP_ITEM)
+        self.sceneSelType = selServ.LookupType(lx.symbol.sSELTYP_SCENE)
+        self.maskType = lx.service.Scene().ItemTypeLookup(lx.symbol.sITYPE_MASK)
+
+        # indices of MASK_CHANNELS, looked up on the first prefetch that finds
+        # a mask in the scene
+        self.maskIndices = set()
+
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(prefetch)
+
+    def schedule(self):
+        '''
+        (Re)start the prefetch timer.
+        '''
+        self.timer.start(PREFETCH_DELAY)
+
+    def invalidate_materials(self, item):
+        '''
+        Drop the material list if the item is a mask.
+        '''
+        if ('materials' in _cache or _retry) and lx.object.Item(item).TestType(self.maskType):
+            invalidate('materials')
+            self.schedule()
+
+    def selevent_Current(self, type):
+        if type == self.sceneSelType:
+            invalidate()
+            self.schedule()
+
+    def selevent_Add(self, type, subtType):
+        if type == self.itemSelType:
+            invalidate('channels')
+            self.schedule()
+
+    def selevent_Remove(self, type, subtType):
+        if type == self.itemSelType:
+            invalidate('channels')
+            self.schedule()
+
+    def sil_SceneClear(self, scene):
+        invalidate()
+
+    def sil_SceneDestroy(self, scene):
+        invalidate()
+
+    def sil_ItemAdd(self, item):
+        self.invalidate_materials(item)
+
+    def sil_ItemRemove(self, item):
+        invalidate('channels')
+        self.invalidate_materials(item)
+
+    def sil_ItemName(self, item):
+        self.invalidate_materials(item)
+
+    def sil_ItemAddChannel(self, item):
+        invalidate('channels')
+        self.schedule()
+
+    def sil_ItemPackage(self, item):
+        # adding or removing a package changes the item's channels
+        invalidate('channels')
+        self.schedule()
+
+    def sil_ChannelValue(self, action, item, index):
+        # A mask's name follows its polygon tag and tag type channels. This fires
+        # for every channel edit in the scene, so rule out everything else with
+        # the cheapest checks before touching the item.
+        if index not in self.maskIndices or ('materials' not in _cache and not _retry):
+            return
+        self.invalidate_materials(item)
+
+
+def is_running():
+    '''
+    Return True if prefetching is enabled.
+    '''
+    return _listener is not None
+
+
+def start():
+    '''
+    Register the listener and prefetch the current scene.
+    '''
+    global _listener
+    if _listener is not None:
+        return
+    listener = PrefetchListener()
+    listener.com = lx.object.Unknown(listener)
+    lx.service.Listener().AddListener(listener.com)
+    _listener = listener
+    _listener.schedule()
+
+
+def stop():
+    '''
+    Unregister the listener and drop the cache.
+    '''
+    global _listener, _retry
+    if _listener is None:
+        return
+    _listener.timer.stop()
+    lx.service.Listener().RemoveListener(_listener.com)
+    _listener = None
+    _retry = False
+    invalidate()
@@ -0,0 +1,67 @@
+# tc_popups.scene
+# Low-level scene enumeration for the popup.* commands.
+
+# The TD API (modo.Scene().items(), modo.Scene().selected) wraps every item it
+# returns in a modo.Item object. On heavy scenes that wrapping dominates the time
+# it takes to display a pop-up, so here we walk the scene through the lx services
+# directly and return only the names and idents the commands actually use.
+
+
+import lx
+import lxu.select
+
+
+def items_by_type(itemType):
+    '''
+    Return a list of (ident, name) tuples for every item of the given type
+    in the current scene.
+    '''
+    scene = lxu.select.SceneSelection().current()
+    typeID = lx.service.Scene().ItemTypeLookup(itemType)
+
+    result = []
+    for i in range(scene.ItemCount(typeID)):
+        item = scene.ItemByIndex(typeID, i)
+        result.append((item.Ident(), item.UniqueName()))
+    return result
+
+
+def selected_item():
+    '''
+    Return the primary (first) selected item as an lx.object.Item, or None
+    if nothing is selected.
+    '''
+    selServ = lx.service.Selection()
+    selType = selServ.LookupType(lx.symbol.sSELTYP_ITEM)
+    if selServ.Count(selType) == 0:
+        return None
+
+    packetTrans = lx.object.ItemPacketTranslation(selServ.Allocate(lx.symbol.sSELTYP_ITEM))
+    return lx.object.Item(packetTrans.Item(selServ.ByIndex(selType, 0)))
+
+
+def channel_names(item):
+    '''
+    Return the names of all the channels on an lx.object.Item.
+    '''
+    return [item.ChannelName(i) for i in range(item.ChannelCount())]
+
+
+def channel_index(itemType, channelName):
+    '''
+    Return the index of a channel on items of the given type, or None if the
+    scene has no item of that type to look it up on.
+    '''
+    scene = lxu.select.SceneSelection().current()
+    typeID = lx.service.Scene().ItemTypeLookup(itemType)
+    if scene.ItemCount(typeID) == 0:
+        return None
+    return scene.ItemByIndex(typeID, 0).ChannelLookup(channelName)
+
+
+def material_names():
+    '''
+    Return a sorted list of the material tags in the scene.
+    '''
+    allMasks = items_by_type(lx.symbol.sITYPE_MASK)
+    return sorted([name.split(' (Material)')[0] for ident, name in allMasks if name.endswith('(Material)')])